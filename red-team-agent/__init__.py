@@ -1,11 +1,29 @@
 """Red Team Agent Package"""
-from .agent import RedTeamAgent, activate_agent
+import importlib
+
+# config is lightweight and must be bound eagerly: importing any submodule
+# that does `from .config import config` would otherwise shadow it with the module
 from .config import config
 
-# Import run function for easy access
+# Heavy (LangChain) imports are deferred until first attribute access (PEP 562)
+_LAZY = {
+    "RedTeamAgent": "agent",
+    "activate_agent": "agent",
+}
+
+# Import run function for easy access. Bound eagerly for the same shadowing
+# reason as config; run.py only imports the agent when run() is called
 try:
     from .run import run, DEFAULT_WEBSITE
     __all__ = ["RedTeamAgent", "activate_agent", "config", "run", "DEFAULT_WEBSITE"]
 except ImportError:
     __all__ = ["RedTeamAgent", "activate_agent", "config"]
 
+
+def __getattr__(name):
+    if name in _LAZY:
+        module = importlib.import_module("." + _LAZY[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,8 +3,11 @@ import sys
 import os
 import argparse
 
+_PARENT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 # Add parent directory to path so we can import from red_team_agent package
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if not __package__ and _PARENT not in sys.path:
+    sys.path.insert(0, _PARENT)
 
 from red_team_agent import activate_agent
 
@@ -3,24 +3,49 @@ from langchain_openai import ChatOpenAI
 from langchain.agents import create_agent
 from langchain_core.messages import HumanMessage, AIMessage, ToolMessage
 from typing import Optional
+import functools
 import sys
 import os
 
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
 # Handle both package and direct imports
-try:
+if __package__:
     from .config import config
     from .tools import get_tools
     from .prompts import get_default_task_prompt, SYSTEM_PROMPT
     from .logger import AgentLogger
-except ImportError:
+else:
     # For direct script execution
-    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    if _HERE not in sys.path:
+        sys.path.insert(0, _HERE)
     from config import config
     from tools import get_tools
     from prompts import get_default_task_prompt, SYSTEM_PROMPT
     from logger import AgentLogger
 
 
+# Shared args placeholder for tool results, which carry no call arguments
+_EMPTY_ARGS: dict = {}
+
+
+@functools.lru_cache(maxsize=8)
+def _make_llm(model_name: str, base_url: str, api_key: str, temperature: float) -> ChatOpenAI:
+    """Create (or reuse) a ChatOpenAI client so its HTTP pool survives across agents"""
+    return ChatOpenAI(
+        model=model_name,
+        openai_api_base=base_url,
+        openai_api_key=api_key,
+        temperature=temperature,
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _cached_tools() -> tuple:
+    """Build the tool list once per process"""
+    return tuple(get_tools())
+
+
 class RedTeamAgent:
     """Red Team Agent for security testing websites"""
     
@@ -51,16 +76,16 @@ class RedTeamAgent:
     
     def _create_llm(self) -> ChatOpenAI:
         """Create LLM instance with OpenRouter"""
-        return ChatOpenAI(
-            model=self.model_name,
-            openai_api_base=config.OPENROUTER_BASE_URL,
-            openai_api_key=config.OPENROUTER_API_KEY,
-            temperature=config.TEMPERATURE,
+        return _make_llm(
+            self.model_name,
+            config.OPENROUTER_BASE_URL,
+            config.OPENROUTER_API_KEY,
+            config.TEMPERATURE,
         )
     
     def _create_agent(self):
         """Create the agent with tools and prompt"""
-        tools = get_tools()
+        tools = list(_cached_tools())
         
         agent = create_agent(
             model=self.llm,
@@ -120,18 +145,21 @@ class RedTeamAgent:
         
         # Process messages and print CoT
         step_num = 0
+        num_messages = len(messages)
+        log_message = self.logger.log_message
+        log_tool_call = self.logger.log_tool_call
         for i, msg in enumerate(messages):
             if isinstance(msg, AIMessage):
                 content = msg.content or ""
                 
                 # Log message
                 if content.strip():
-                    self.logger.log_message("ai", content)
+                    log_message("ai", content)
                 
                 # Print reasoning/CoT (all AI messages except the very last one are reasoning steps)
-                is_final = (i == len(messages) - 1 or 
-                           (i < len(messages) - 1 and 
-                            not any(isinstance(messages[j], ToolMessage) for j in range(i+1, min(i+3, len(messages))))))
+                is_final = (i == num_messages - 1 or 
+                           (i < num_messages - 1 and 
+                            not any(isinstance(messages[j], ToolMessage) for j in range(i+1, min(i+3, num_messages)))))
                 
                 if verbose and content.strip() and not is_final:
                     # Extract first meaningful sentence/line
@@ -159,17 +187,18 @@ class RedTeamAgent:
                             else:
                                 args_str = ""
                             print(f"  🔧 Step {step_num}: {tool_name}({args_str})")
-                        self.logger.log_tool_call(tool_name, tool_call.get('args', {}), "pending")
+                        log_tool_call(tool_name, tool_call.get('args', {}), "pending")
             
             elif isinstance(msg, ToolMessage):
                 tool_name = getattr(msg, 'name', 'unknown')
-                tool_result = msg.content[:100] if msg.content else ""
-                if verbose and tool_result:
-                    result_preview = tool_result.replace('\n', ' ').strip()
+                content = msg.content
+                snippet = content[:1000] if content else ""
+                if verbose and snippet:
+                    result_preview = snippet[:100].replace('\n', ' ').strip()
                     if len(result_preview) > 100:
                         result_preview = result_preview[:97] + "..."
                     print(f"  ✓ {result_preview}")
-                self.logger.log_tool_call(tool_name, {}, msg.content[:1000] if msg.content else "")
+                log_tool_call(tool_name, _EMPTY_ARGS, snippet)
         
         # Get final output
         final_output = ""
@@ -223,10 +252,9 @@ def activate_agent(
     # Open browser if requested
     if open_browser:
         try:
-            try:
+            if __package__:
                 from .browser_automation import open_website_in_browser
-            except ImportError:
-                sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+            else:
                 from browser_automation import open_website_in_browser
             open_website_in_browser(website_url, use_playwright=use_playwright, headless=False)
         except Exception as e:
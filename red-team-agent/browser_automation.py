@@ -1,4 +1,5 @@
 """Browser automation for visualizing agent testing process"""
+import importlib.util
 import subprocess
 import webbrowser
 from typing import Optional
@@ -6,14 +7,15 @@ from pathlib import Path
 import sys
 import os
 
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
 # Handle both package and direct imports
-try:
+if __package__:
     from .logger import AgentLogger
-except ImportError:
+else:
     # For direct script execution
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    if current_dir not in sys.path:
-        sys.path.insert(0, current_dir)
+    if _HERE not in sys.path:
+        sys.path.insert(0, _HERE)
     try:
         from logger import AgentLogger
     except ImportError:
@@ -46,40 +48,43 @@ class BrowserAutomation:
             print(f"⚠️  Could not open browser: {e}")
             return False
     
-    def open_with_playwright(self, headless: bool = False):
+    def open_with_playwright(self, headless: bool = False, interactive: bool = True):
         """
         Open browser using Playwright (if installed)
         Requires: pip install playwright && playwright install
         
         Args:
             headless: If True, run browser in headless mode
+            interactive: If True and not headless, wait for Enter before closing the browser
         """
         try:
             from playwright.sync_api import sync_playwright
             
             print(f"🎭 Opening browser with Playwright: {self.website_url}")
             
+            # The driver is scoped to this call: while it runs, the calling
+            # thread cannot use asyncio or start another sync_playwright()
             with sync_playwright() as p:
-                browser = p.chromium.launch(headless=headless)
-                page = browser.new_page()
-                page.goto(self.website_url)
-                
-                if not headless:
-                    print("Browser window opened. Press Enter to close...")
-                    input()
-                
-                # Take screenshot if logger is available
-                if self.logger:
-                    screenshot_dir = Path(self.logger.output_dir) / "screenshots"
-                    screenshot_dir.mkdir(exist_ok=True)
-                    screenshot_path = screenshot_dir / f"{self.logger.run_id}_initial.png"
-                    page.screenshot(path=str(screenshot_path))
-                    print(f"📸 Screenshot saved: {screenshot_path}")
-                
-                if headless:
-                    browser.close()
-                else:
-                    print("Closing browser...")
+                browser = p.chromium.launch(
+                    headless=headless,
+                    args=["--disable-gpu", "--disable-dev-shm-usage"]
+                )
+                try:
+                    page = browser.new_page()
+                    page.goto(self.website_url)
+                    
+                    if interactive and not headless:
+                        print("Browser window opened. Press Enter to close...")
+                        input()
+                    
+                    # Take screenshot if logger is available
+                    if self.logger:
+                        screenshot_dir = Path(self.logger.output_dir) / "screenshots"
+                        screenshot_dir.mkdir(exist_ok=True)
+                        screenshot_path = screenshot_dir / f"{self.logger.run_id}_initial.png"
+                        page.screenshot(path=str(screenshot_path))
+                        print(f"📸 Screenshot saved: {screenshot_path}")
+                finally:
                     browser.close()
             
             self.browser_opened = True
@@ -94,11 +99,10 @@ class BrowserAutomation:
     
     @staticmethod
     def is_playwright_available() -> bool:
-        """Check if Playwright is available"""
+        """Check if Playwright is available (without importing it)"""
         try:
-            from playwright.sync_api import sync_playwright
-            return True
-        except ImportError:
+            return importlib.util.find_spec("playwright.sync_api") is not None
+        except ModuleNotFoundError:
             return False
 
 
@@ -4,11 +4,7 @@ import os
 import argparse
 import textwrap
 
-# Add current directory to path
-current_dir = os.path.dirname(os.path.abspath(__file__))
-sys.path.insert(0, current_dir)
-
-from agent import activate_agent
+_HERE = os.path.dirname(os.path.abspath(__file__))
 
 # Default website (the one we've been using)
 DEFAULT_WEBSITE = "https://v0.app/chat/blog-with-hidden-vulnerability-rVsrXU04WBX"
@@ -44,6 +40,15 @@ def run(model: str = None, website: str = DEFAULT_WEBSITE,
     Returns:
         Agent execution result dictionary
     """
+    # Imported here so importing this module (and the package) stays light
+    if __package__:
+        from .agent import activate_agent
+    else:
+        # Add current directory to path
+        if _HERE not in sys.path:
+            sys.path.insert(0, _HERE)
+        from agent import activate_agent
+    
     # Minimal header
     print(f"\n🔴 Testing: {website}")
     print(f"🤖 Model: {model or 'default'}\n")
@@ -2,12 +2,16 @@
 import sys
 import os
 
-# Add current directory to path
-current_dir = os.path.dirname(os.path.abspath(__file__))
-sys.path.insert(0, current_dir)
+_HERE = os.path.dirname(os.path.abspath(__file__))
 
-# Import directly
-from agent import activate_agent
+# Handle both package and direct imports
+if __package__:
+    from .agent import activate_agent
+else:
+    # Add current directory to path
+    if _HERE not in sys.path:
+        sys.path.insert(0, _HERE)
+    from agent import activate_agent
 
 # Target URL and model
 WEBSITE_URL = "https://v0.app/chat/blog-with-hidden-vulnerability-rVsrXU04WBX"
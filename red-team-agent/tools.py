@@ -8,11 +8,14 @@ import re
 import json
 from urllib.parse import urlparse, urljoin, parse_qs, urlencode
 
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
 # Handle both package and direct imports
-try:
+if __package__:
     from .config import config
-except ImportError:
-    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+else:
+    if _HERE not in sys.path:
+        sys.path.insert(0, _HERE)
     from config import config
 
 
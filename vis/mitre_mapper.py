@@ -1,153 +1,272 @@
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+import lxml.html
+from lxml import etree
 import csv
 from datetime import datetime
 import uuid
 import time
+import os
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-def extract_all_campaigns():
+try:
+    import requests_cache
+except ImportError:
+    requests_cache = None  # Optional: pip install requests-cache
+
+logger = logging.getLogger(__name__)
+
+BASE_URL = "https://attack.mitre.org"
+REQUEST_TIMEOUT = 10
+USER_AGENT = "canary-mitre-mapper/1.0"
+
+# On-disk HTTP cache used when requests-cache is installed
+CACHE_NAME = 'mitre_cache'
+CACHE_EXPIRE_SECONDS = 24 * 3600
+
+# Output CSV columns, in the order rows are written
+FIELDNAMES = ('created_at', 'attack_id', 'aml_id', 'base_url', 'session_id')
+
+# Campaign pages fetched at once; stays within the session's pool_maxsize
+MAX_CONCURRENT_REQUESTS = 8
+
+# Global politeness cap on requests to attack.mitre.org
+MAX_REQUESTS_PER_SECOND = 5
+
+class RateLimiter:
+    """
+    Token bucket shared by all worker threads.
+    Callers only sleep when the bucket is empty.
+    """
+    
+    def __init__(self, rate, per=1.0):
+        self.rate = rate
+        self.per = per
+        self.tokens = float(rate)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate / self.per)
+            self.updated = now
+            # Reserve a token; a negative balance is the wait owed to earlier callers
+            self.tokens -= 1
+            wait = -self.tokens * self.per / self.rate if self.tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+_RATE_LIMITER = RateLimiter(MAX_REQUESTS_PER_SECOND)
+
+# XPath queries are compiled once and evaluated in C by lxml
+_CAMPAIGNS_TABLE_XPATH = etree.XPath(
+    "//table[contains(concat(' ', normalize-space(@class), ' '), ' table-techniques ')]"
+)
+_FIRST_TABLE_XPATH = etree.XPath("(//table)[1]")
+
+# First technique link in each data row of the techniques table. The header
+# keywords alone also match the ID column of Groups/Software tables, so the
+# chosen table must be the first ID/Technique-headed table that actually
+# links to techniques from one of its data rows
+_TECHNIQUE_LINKS_XPATH = etree.XPath(
+    "(//table[.//thead//th[contains(., 'Technique') or contains(., 'ID')]]"
+    "[.//tr[td]//a[contains(@href, '/techniques/T')]])[1]"
+    "//tr[td]/descendant::a[contains(@href, '/techniques/T')][1]"
+)
+
+def create_session():
+    """
+    Creates the session shared by every page fetch, so requests reuse
+    pooled keep-alive connections to attack.mitre.org.
+    With requests-cache installed, pages are also cached on disk so re-runs
+    only revalidate instead of re-downloading.
+    """
+    if requests_cache is not None:
+        session = requests_cache.CachedSession(
+            CACHE_NAME,
+            backend='sqlite',
+            expire_after=CACHE_EXPIRE_SECONDS
+        )
+    else:
+        session = requests.Session()
+    # Retry transient failures with exponential backoff; 429/503 responses
+    # are retried after the server's Retry-After delay
+    retries = Retry(
+        total=5,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(['GET']),
+        respect_retry_after_header=True
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=16, max_retries=retries)
+    session.mount(BASE_URL, adapter)
+    session.headers.update({
+        # gzip/deflate, plus br when urllib3 can decode it (brotli installed)
+        "Accept-Encoding": ACCEPT_ENCODING,
+        "User-Agent": USER_AGENT,
+    })
+    return session
+
+def _is_fresh_in_cache(session, url):
+    """
+    Checks whether a GET for url will be answered from the requests-cache
+    store without touching the network
+    """
+    cache = getattr(session, 'cache', None)
+    if cache is None:
+        return False
+    key = cache.create_key(session.prepare_request(requests.Request('GET', url)))
+    cached = cache.get_response(key)
+    return cached is not None and not cached.is_expired
+
+def _get_page(session, url):
+    """
+    GETs a page, taking a rate-limiter token only for requests that actually
+    go to attack.mitre.org (fresh cache hits are served immediately)
+    """
+    if not _is_fresh_in_cache(session, url):
+        _RATE_LIMITER.acquire()
+    return session.get(url, timeout=REQUEST_TIMEOUT)
+
+def extract_all_campaigns(session):
     """
     Extracts all campaigns from MITRE ATT&CK campaigns page
     """
-    base_url = "https://attack.mitre.org"
+    base_url = BASE_URL
     campaigns_url = f"{base_url}/campaigns/"
     
-    print(f"Fetching campaigns from {campaigns_url}...")
+    logger.info("Fetching campaigns from %s...", campaigns_url)
     
     # Get the main campaigns page
-    response = requests.get(campaigns_url)
+    response = _get_page(session, campaigns_url)
     response.raise_for_status()
     
-    soup = BeautifulSoup(response.content, 'html.parser')
+    tree = lxml.html.fromstring(response.content)
     
     # Find all campaign links in the table
     campaigns = []
     
     # Look for the campaigns table
-    table = soup.find('table', {'class': 'table-techniques'})
+    tables = _CAMPAIGNS_TABLE_XPATH(tree)
     
-    if not table:
+    if not tables:
         # Try alternative selectors
-        table = soup.find('table')
+        tables = _FIRST_TABLE_XPATH(tree)
     
-    if table:
-        rows = table.find_all('tr')[1:]  # Skip header row
+    if tables:
+        rows = tables[0].xpath('.//tr')[1:]  # Skip header row
         
         for row in rows:
-            cols = row.find_all('td')
+            cols = row.findall('td')
             if len(cols) >= 2:
                 # Extract campaign ID and name
-                campaign_link = cols[0].find('a')
-                if campaign_link:
-                    campaign_id = campaign_link.text.strip()
-                    campaign_url = base_url + campaign_link['href']
-                    campaign_name = cols[1].text.strip() if len(cols) > 1 else ""
+                campaign_link = cols[0].find('.//a')
+                if campaign_link is not None:
+                    campaign_id = campaign_link.text_content().strip()
+                    campaign_url = base_url + campaign_link.get('href')
+                    campaign_name = cols[1].text_content().strip()
                     
                     campaigns.append({
                         'id': campaign_id,
                         'name': campaign_name,
                         'url': campaign_url
                     })
-                    print(f"Found: {campaign_id} - {campaign_name}")
+                    logger.debug("Found: %s - %s", campaign_id, campaign_name)
     
-    print(f"\nTotal campaigns found: {len(campaigns)}")
+    logger.info("Total campaigns found: %d", len(campaigns))
     return campaigns
 
-def extract_techniques_for_campaign(campaign_url, campaign_id):
+def extract_techniques_for_campaign(campaign_url, campaign_id, session):
     """
     Extracts all techniques (TTPs) for a specific campaign
     """
-    print(f"\nExtracting techniques for {campaign_id}...")
+    logger.debug("Extracting techniques for %s...", campaign_id)
     
     try:
-        response = requests.get(campaign_url)
+        response = _get_page(session, campaign_url)
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        techniques = []
-        
-        # Find the techniques table
-        # Look for table with techniques
-        tables = soup.find_all('table')
+        tree = lxml.html.fromstring(response.content)
         
-        for table in tables:
-            # Check if this is the techniques table
-            header = table.find('thead')
-            if header and ('Technique' in header.text or 'ID' in header.text):
-                rows = table.find_all('tr')[1:]  # Skip header
-                
-                for row in rows:
-                    cols = row.find_all('td')
-                    if cols:
-                        # Try to find technique ID
-                        technique_link = row.find('a', href=lambda x: x and '/techniques/' in x)
-                        if technique_link:
-                            technique_id = technique_link.text.strip()
-                            techniques.append(technique_id)
+        # Find the techniques table rows and take each row's technique link,
+        # de-duplicating as we collect
+        techniques = {link.text_content().strip() for link in _TECHNIQUE_LINKS_XPATH(tree)}
         
-        # Remove duplicates
-        techniques = list(set(techniques))
-        print(f"Found {len(techniques)} techniques for {campaign_id}")
+        # Sorted for stable CSV output
+        techniques = sorted(techniques)
+        logger.debug("Found %d techniques for %s", len(techniques), campaign_id)
         
         return techniques
         
     except Exception as e:
-        print(f"Error extracting techniques for {campaign_id}: {e}")
+        logger.warning("Error extracting techniques for %s: %s", campaign_id, e)
         return []
 
+def extract_techniques_for_campaigns(campaigns, session, concurrency=MAX_CONCURRENT_REQUESTS):
+    """
+    Extracts techniques for many campaigns concurrently over the shared session.
+    Yields (campaign, techniques) pairs as soon as each campaign finishes, so a
+    slow page never holds back the ones behind it.
+    """
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = {
+            pool.submit(extract_techniques_for_campaign, campaign['url'], campaign['id'], session): campaign
+            for campaign in campaigns
+        }
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
 def main():
-    # Extract all campaigns
-    campaigns = extract_all_campaigns()
-    
-    # Prepare CSV data
-    csv_data = []
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(message)s')
     
-    # For each campaign, extract techniques
-    for i, campaign in enumerate(campaigns, 1):
-        print(f"\n[{i}/{len(campaigns)}] Processing {campaign['id']}...")
+    with create_session() as session:
+        # Extract all campaigns
+        campaigns = extract_all_campaigns(session)
         
-        techniques = extract_techniques_for_campaign(campaign['url'], campaign['id'])
+        output_file = 'mitre_campaigns_full.csv'
+        total_rows = 0
         
-        # Create CSV rows
+        # One logical run timestamp shared by every row
         timestamp = datetime.now().isoformat()
         
-        if techniques:
-            for technique in techniques:
-                csv_data.append({
-                    'created_at': timestamp,
-                    'attack_id': campaign['id'],
-                    'aml_id': technique,
-                    'base_url': campaign['url'],
-                    'session_id': str(uuid.uuid4())
-                })
-        else:
-            # Even if no techniques found, add campaign entry
-            csv_data.append({
-                'created_at': timestamp,
-                'attack_id': campaign['id'],
-                'aml_id': '',
-                'base_url': campaign['url'],
-                'session_id': str(uuid.uuid4())
-            })
-        
-        # Be respectful - add a small delay between requests
-        if i < len(campaigns):
-            time.sleep(1)
-    
-    # Write to CSV
-    output_file = 'mitre_campaigns_full.csv'
-    
-    with open(output_file, 'w', newline='', encoding='utf-8') as f:
-        fieldnames = ['created_at', 'attack_id', 'aml_id', 'base_url', 'session_id']
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        
-        writer.writeheader()
-        writer.writerows(csv_data)
-    
+        # Write rows as each campaign is processed instead of buffering them all
+        with open(output_file, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
+            writer = csv.writer(f)
+            
+            writer.writerow(FIELDNAMES)
+            
+            # For each campaign, extract techniques
+            results = extract_techniques_for_campaigns(campaigns, session)
+            for i, (campaign, techniques) in enumerate(results, 1):
+                logger.info("[%d/%d] Processed %s: %d techniques", i, len(campaigns), campaign['id'], len(techniques))
+                
+                # Create CSV rows
+                # Even if no techniques found, add campaign entry
+                aml_ids = techniques or ['']
+                
+                # One urandom read per campaign instead of one per row
+                seed = os.urandom(16 * len(aml_ids))
+                
+                campaign_id = campaign['id']
+                campaign_url = campaign['url']
+                writer.writerows(
+                    (timestamp, campaign_id, technique, campaign_url,
+                     str(uuid.UUID(bytes=seed[idx * 16:(idx + 1) * 16], version=4)))
+                    for idx, technique in enumerate(aml_ids)
+                )
+                total_rows += len(aml_ids)
+                
+                # Push each finished campaign to disk so a crash keeps partial progress
+                f.flush()
+
     print(f"\n✓ Data saved to {output_file}")
     print(f"Total campaigns: {len(campaigns)}")
-    print(f"Total rows: {len(csv_data)}")
+    print(f"Total rows: {total_rows}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file